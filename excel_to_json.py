@@ -1,44 +1,54 @@
-import openpyxl
-import json
+import orjson
+import os
 import re
 from pathlib import Path
+from workbook_cache import load_workbook, use_cache_from_argv
 
 EXCEL_FILE = "ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx"
 OUT_JSON = "catalog.json"
 
-def parse_sheet(ws, sheet_name):
+# Шаблоны компилируем один раз на модуль (specs уже в нижнем регистре)
+_POWER_RE = re.compile(r'(\d+)\s*вт')
+_LUMENS_RE = re.compile(r'(\d+)\s*лм')
+_IP_RE = re.compile(r'ip(\d{2})')
+_NON_WORD_RE = re.compile(r'[\W]+')
+_IMAGE_URL_PREFIX = "https://ene-rgy.ru/images/"
+_NRG_RE = re.compile(r'NRG', re.IGNORECASE)  # без model.upper() на каждой строке
+
+def parse_sheet(rows, sheet_name, seen):
+    """seen — общее для всех листов множество моделей: повторы пропускаем до разбора характеристик."""
     items = []
     print(f"Processing sheet: {sheet_name}")
     
-    for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+    for row_num, row in enumerate(rows[1:], start=2):
         if len(row) < 3 or not row[0]:  # Проверяем, что есть хотя бы 3 столбца и первый не пустой
             continue
         
         model = str(row[0]).strip() if row[0] else None
         print(f"Row {row_num}: Model = '{model}'")  # DEBUG: смотрим, что находим
         
-        if not model or 'NRG' not in model.upper():
+        if not model or not _NRG_RE.search(model) or model in seen:
             continue
+        seen.add(model)
         
         specs = str(row[2] or '') if len(row) > 2 else ''
         specs_lower = specs.lower()
         
         # Парсим характеристики
-        power_match = re.search(r'(\d+)\s*вт', specs_lower)
+        power_match = _POWER_RE.search(specs_lower)
         power = int(power_match.group(1)) if power_match else None
         
-        lumens_match = re.search(r'(\d+)\s*лм', specs_lower)
+        lumens_match = _LUMENS_RE.search(specs_lower)
         lumens = int(lumens_match.group(1)) if lumens_match else None
         
-        ip_match = re.search(r'ip(\d{2})', specs_lower)
+        ip_match = _IP_RE.search(specs_lower)
         ip = ip_match.group(1) if ip_match else None
         ip_rating = f"IP{ip}" if ip else None
         
         category = sheet_name.lower()
         
-        # Создаём URL изображения (исправленный f-string)
-        sanitized_model = re.sub(r'[\W]+', '-', model.lower())
-        image_url = f"https://ene-rgy.ru/images/{sanitized_model}.jpg"
+        # Создаём URL изображения: префикс — константа модуля, склеиваем без форматирования
+        image_url = _IMAGE_URL_PREFIX + _NON_WORD_RE.sub('-', model.lower()) + ".jpg"
         
         item = {
             "model": model,
@@ -56,7 +66,7 @@ def parse_sheet(ws, sheet_name):
     print(f"Found {len(items)} items in sheet '{sheet_name}'")
     return items
 
-def excel_to_json(excel_path, json_path):
+def excel_to_json(excel_path, json_path, use_cache=False):
     try:
         if not Path(excel_path).exists():
             print(f"ERROR: Excel file not found: {excel_path}")
@@ -66,23 +76,26 @@ def excel_to_json(excel_path, json_path):
             return
         
         print(f"Loading Excel: {excel_path}")
-        wb = openpyxl.load_workbook(excel_path, data_only=True)
-        print(f"Found {len(wb.sheetnames)} sheets: {wb.sheetnames}")
-        
-        catalog = []
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            sheet_items = parse_sheet(ws, sheet_name)
-            catalog.extend(sheet_items)
-        
-        unique_items = {item['model']: item for item in catalog}.values()
+        sheets, _ = load_workbook(excel_path, use_cache=use_cache)
+        print(f"Found {len(sheets)} sheets: {list(sheets)}")
         
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(list(unique_items), f, ensure_ascii=False, indent=2)
+        # Пишем JSON-массив по мере разбора листов; дубликаты моделей parse_sheet отсекает по общему seen.
+        # Пишем во временный файл и подменяем в конце — ошибка на полпути не затрёт прошлый каталог
+        seen = set()
+        tmp_path = f"{json_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b'[')
+            sep = b''
+            for sheet_name, rows in sheets.items():
+                for item in parse_sheet(rows, sheet_name, seen):
+                    f.write(sep + orjson.dumps(item))
+                    sep = b','
+            f.write(b']')
+        os.replace(tmp_path, json_path)
         
-        print(f"SUCCESS: Saved {len(unique_items)} unique items to {json_path}")
+        print(f"SUCCESS: Saved {len(seen)} unique items to {json_path}")
         
-        if len(unique_items) == 0:
+        if len(seen) == 0:
             print("WARNING: No items found. Check:")
             print("  1. Excel file structure (models should be in column A)")
             print("  2. Models should contain 'NRG' in name")
@@ -94,4 +107,4 @@ def excel_to_json(excel_path, json_path):
         traceback.print_exc()
 
 if __name__ == "__main__":
-    excel_to_json(EXCEL_FILE, OUT_JSON)
\ No newline at end of file
+    excel_to_json(EXCEL_FILE, OUT_JSON, use_cache=use_cache_from_argv())
\ No newline at end of file
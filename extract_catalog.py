@@ -1,10 +1,21 @@
-import openpyxl
 import os
-import json
+import msgpack
+import shutil
+import zipfile
+from xlsx_images import sheet_images
+from workbook_cache import load_workbook, use_cache_from_argv
 
-# Загружаем Excel
-wb = openpyxl.load_workbook("ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx")
-ws = wb.active
+EXCEL_FILE = "ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx"
+
+# Загружаем Excel: значения через calamine (workbook_cache), картинки — напрямую из zip
+sheets, active = load_workbook(EXCEL_FILE, use_cache=use_cache_from_argv())
+zf = zipfile.ZipFile(EXCEL_FILE)
+
+# координаты якоря (row, col) начинаются с 0; берём первую картинку в строке
+images_by_row = {}
+for img_row, img_col, img_target in sheet_images(zf):
+    if img_col == 1:  # колонка B
+        images_by_row.setdefault(img_row + 1, img_target)
 
 # Папка для картинок
 output_dir = "images"
@@ -13,23 +24,20 @@ os.makedirs(output_dir, exist_ok=True)
 catalog = []
 
 # Перебор строк начиная с 5-й
-for row in range(5, ws.max_row + 1):
-    model = ws[f"A{row}"].value
-    desc = ws[f"C{row}"].value
-    retail = ws[f"D{row}"].value
-    wholesale = ws[f"E{row}"].value
+for row_idx, row in enumerate(sheets[active][4:], start=5):
+    # лист может быть уже пяти колонок — недостающие ячейки считаем пустыми, как openpyxl
+    model, _, desc, retail, wholesale = (row + (None,) * 5)[:5]
 
     if not model:
         continue
 
     # Проверяем картинки (они могут быть в ячейке B)
     img_path = None
-    for img in ws._images:
-        # openpyxl хранит координаты как (row, col), начиная с 0
-        if img.anchor._from.row == row - 1 and img.anchor._from.col == 1:  # колонка B
-            img_path = os.path.join(output_dir, f"{model}.png")
-            img.image.save(img_path)  # сохраняем файл
-            break
+    img_target = images_by_row.get(row_idx)
+    if img_target is not None:
+        img_path = os.path.join(output_dir, f"{model}{os.path.splitext(img_target)[1]}")
+        with zf.open(img_target) as src, open(img_path, "wb") as out:
+            shutil.copyfileobj(src, out)  # сохраняем файл как есть, без перекодирования
 
     catalog.append({
         "model": model,
@@ -39,8 +47,10 @@ for row in range(5, ws.max_row + 1):
         "image": img_path or None
     })
 
-# Сохраняем в JSON
-with open("catalog.json", "w", encoding="utf-8") as f:
-    json.dump(catalog, f, ensure_ascii=False, indent=2)
+zf.close()
+
+# Сохраняем в MessagePack (компактнее и быстрее разбирается, чем JSON)
+with open("catalog.msgpack", "wb") as f:
+    msgpack.pack(catalog, f, use_bin_type=True)
 
-print("✅ catalog.json создан, фото сохранены в папку images/")
+print("✅ catalog.msgpack создан, фото сохранены в папку images/")
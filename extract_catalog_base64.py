@@ -1,49 +1,64 @@
-import openpyxl
 import os
-import json
-import base64
+import msgpack
+import zipfile
 from io import BytesIO
-from PIL import Image as PILImage  # pip install pillow openpyxl
+from PIL import Image as PILImage  # pip install pillow
+from xlsx_images import sheet_images, sniff_image_type
+from workbook_cache import load_workbook, use_cache_from_argv
 
-# Загружаем Excel
-wb = openpyxl.load_workbook("ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx")
-ws = wb.active
+EXCEL_FILE = "ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx"
+
+# Загружаем Excel: значения через calamine (workbook_cache), картинки — напрямую из zip
+sheets, active = load_workbook(EXCEL_FILE, use_cache=use_cache_from_argv())
+zf = zipfile.ZipFile(EXCEL_FILE)
+
+# координаты якоря (row, col) начинаются с 0; берём первую картинку в строке
+images_by_row = {}
+for img_row, img_col, img_target in sheet_images(zf):
+    if img_col == 1:  # колонка B
+        images_by_row.setdefault(img_row + 1, img_target)
 
 catalog = []
 
 # Перебор строк начиная с 5-й
-for row in range(5, ws.max_row + 1):
-    model = ws[f"A{row}"].value
-    desc = ws[f"C{row}"].value
-    retail = ws[f"D{row}"].value
-    wholesale = ws[f"E{row}"].value
+for row_idx, row in enumerate(sheets[active][4:], start=5):
+    # лист может быть уже пяти колонок — недостающие ячейки считаем пустыми, как openpyxl
+    model, _, desc, retail, wholesale = (row + (None,) * 5)[:5]
 
     if not model:
         continue
 
-    img_base64 = None
-    for img in ws._images:
-        if img.anchor._from.row == row - 1 and img.anchor._from.col == 1:  # колонка B
-            try:
-                img_bytes = img._data()
-                pil_img = PILImage.open(BytesIO(img_bytes))
+    img_data = img_type = None
+    img_target = images_by_row.get(row_idx)
+    if img_target is not None:
+        try:
+            # PNG/JPEG/GIF/WebP встраиваем исходными байтами — в MessagePack они хранятся как есть;
+            # через PIL перекодируем в PNG только то, что браузер не покажет (EMF, TIFF, ...);
+            # compress_level=1 — zlib в разы быстрее уровня 6 по умолчанию при почти том же размере
+            img_data = zf.read(img_target)
+            img_type = sniff_image_type(img_data)
+            if img_type is None:
                 buffered = BytesIO()
-                pil_img.save(buffered, format="PNG")  # сохраняем в PNG
-                img_base64 = "data:image/png;base64," + base64.b64encode(buffered.getvalue()).decode()
-            except Exception as e:
-                print(f"⚠️ Ошибка с картинкой {model}: {e}")
-            break
+                PILImage.open(BytesIO(img_data)).save(buffered, format="PNG", compress_level=1)
+                img_data, img_type = buffered.getvalue(), "image/png"
+        except Exception as e:
+            # не оставляем исходные байты без MIME-типа — server.js собрал бы из них битый data URL
+            img_data = img_type = None
+            print(f"⚠️ Ошибка с картинкой {model}: {e}")
 
     catalog.append({
         "model": model,
         "description": desc,
         "price_retail": retail,
         "price_wholesale": wholesale,
-        "image_base64": img_base64
+        "image_data": img_data,
+        "image_type": img_type
     })
 
-# Сохраняем JSON
-with open("catalog.json", "w", encoding="utf-8") as f:
-    json.dump(catalog, f, ensure_ascii=False, indent=2)
+zf.close()
+
+# Сохраняем MessagePack; server.js сам соберёт из image_data data URL для виджета
+with open("catalog.msgpack", "wb") as f:
+    msgpack.pack(catalog, f, use_bin_type=True)
 
-print("✅ catalog.json создан, фотки встроены как base64")
+print("✅ catalog.msgpack создан, фотки встроены как бинарные данные")
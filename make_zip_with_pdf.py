@@ -3,12 +3,18 @@ import zipfile
 
 zip_filename = "EntechChat.zip"
 
+# Файлы проекта кладём в архив как есть — zipfile читает и сжимает их кусками, не держа в памяти
+source_files = [
+    "server.js",
+    "widget.html",
+    "excel_to_json.py",
+    "extract_full_kp.py",
+    "xlsx_images.py",
+    "workbook_cache.py",
+    "scenario.json",
+]
+
 files_content = {
-    "server.js": open("server.js", "r", encoding="utf-8").read(),
-    "widget.html": open("widget.html", "r", encoding="utf-8").read(),
-    "excel_to_json.py": open("excel_to_json.py", "r", encoding="utf-8").read(),
-    "extract_full_kp.py": open("extract_full_kp.py", "r", encoding="utf-8").read(),
-    "scenario.json": open("scenario.json", "r", encoding="utf-8").read(),
     "package.json": """\
 {
   "name": "entech-widget",
@@ -22,6 +28,7 @@ files_content = {
     "test": "jest"
   },
   "dependencies": {
+    "@msgpack/msgpack": "^3.1.0",
     "cors": "^2.8.5",
     "dotenv": "^16.4.5",
     "express": "^4.19.2",
@@ -43,19 +50,24 @@ OPENAI_MODEL=gpt-4o-mini
 ALLOWED_ORIGINS=https://ene-rgy.ru,https://yourproject.tilda.ws
 """,
     "requirements.txt": """\
-openpyxl==3.1.5
-pdfplumber==0.11.4
+python-calamine==0.8.3
+orjson==3.10.15
+msgpack==1.2.3
+pypdfium2==4.30.0
 reportlab==4.2.2
 Pillow==10.4.0
 """,
     "quotes.json": "[]"
 }
 
-with zipfile.ZipFile(zip_filename, "w") as zipf:
+# compresslevel=1 — самый быстрый уровень zlib; архив для раздачи, а не для хранения
+with zipfile.ZipFile(zip_filename, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+    for filename in source_files:
+        zipf.write(filename)
     for filename, content in files_content.items():
         zipf.writestr(filename, content)
-    # Add sample Excel
+    # Add sample Excel — xlsx уже сжат deflate, повторно не сжимаем
     if os.path.exists("ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx"):
-        zipf.write("ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx")
+        zipf.write("ПРАЙС ЛИСТ ЭНТЕХ от 31.08.23.xlsx", compress_type=zipfile.ZIP_STORED)
 
 print(f"ZIP created: {zip_filename}")
\ No newline at end of file
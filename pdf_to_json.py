@@ -1,54 +1,77 @@
-import pdfplumber
-import json
+import pypdfium2 as pdfium
+import orjson
 import re
 
+# Шаблоны компилируем один раз; строка приводится к нижнему регистру заранее,
+# поэтому все литералы здесь в нижнем регистре и re.IGNORECASE не нужен
+_PRODUCT_LINE_RE = re.compile(r'(вт|w|лм|lm|ip\d{2})')
+_MODEL_RE = re.compile(r'([Ee][Nn][Tt][Ee][Cc][Hh][^\s,]*)')  # ищем по исходной строке, чтобы сохранить регистр
+
+# Все числовые поля — одним проходом по строке; поле определяется по m.lastgroup
+_FIELDS_RE = re.compile(
+    r'(?P<power>\d+)\s?(?:вт|w)'
+    r'|(?P<lumens>\d+)\s?(?:лм|lm)'
+    r'|(?P<ip>ip)(?=\d{2})'  # цифры IP не поглощаем — их могут использовать другие поля
+    r'|(?P<dims>(?P<length>\d+)[x×](?P<width>\d+)[x×](?P<height>\d+)\s?(?:мм|mm))'
+    r'|(?P<weight>\d+(?:[.,]\d+)?)\s?(?:кг|kg)'
+    r'|(?P<warranty>\d+)\s?(?:лет|года|г(?=.))'
+)
+
+CATEGORIES = ["промышленный", "уличный", "офисный", "спортивный", "взрывозащищенный", "прожектор"]
+
 def parse_line(line):
     """
     Парсим строку из каталога: модель, мощность, люмены, IP-защита, категория, размеры, вес, гарантия.
     Пример: 'Промышленный светильник ENTECH PRO 100Вт 12000лм IP65 600x200x100мм 5кг Гарантия 5 лет'
+    Возвращает None, если в строке нет ни мощности, ни люменов, ни IP,
+    или если из неё не удалось разобрать ни одного поля (например, голый заголовок 'Вт').
     """
+    line_lc = line.lower()
+
+    # добавляем только строки с мощностью, люменами или IP
+    if not _PRODUCT_LINE_RE.search(line_lc):
+        return None
 
-    # Мощность (Вт)
-    power_match = re.search(r'(\d+)\s?(Вт|W)', line, re.IGNORECASE)
-    power = int(power_match.group(1)) if power_match else None
+    return _parse_fields(line, line_lc)
 
-    # Световой поток (лм)
-    lumen_match = re.search(r'(\d+)\s?(лм|lm)', line, re.IGNORECASE)
-    lumens = int(lumen_match.group(1)) if lumen_match else None
+def _parse_fields(line, line_lc):
+    """
+    Поля товара из строки, уже прошедшей фильтр _PRODUCT_LINE_RE; line_lc — line.lower().
+    None, если ни одно поле не разобрано.
+    """
+    # Мощность (Вт), световой поток (лм), IP-защита,
+    # размеры (например: 600x200x100 мм или 600×200×100 mm), вес (5кг, 12.5 kg),
+    # гарантия (5 лет, 3 года) — для каждого поля берём первое совпадение
+    fields = {}
+    for m in _FIELDS_RE.finditer(line_lc):
+        fields.setdefault(m.lastgroup, m)
+
+    power = int(fields["power"].group("power")) if "power" in fields else None
+    lumens = int(fields["lumens"].group("lumens")) if "lumens" in fields else None
+    ip_rating = line_lc[fields["ip"].start():fields["ip"].end() + 2].upper() if "ip" in fields else None
+
+    size_match = fields.get("dims")
+    dimensions = {
+        "length_mm": int(size_match.group("length")),
+        "width_mm": int(size_match.group("width")),
+        "height_mm": int(size_match.group("height"))
+    } if size_match else None
 
-    # IP-защита
-    ip_match = re.search(r'(IP\d{2})', line, re.IGNORECASE)
-    ip_rating = ip_match.group(1).upper() if ip_match else None
+    weight_kg = float(fields["weight"].group("weight").replace(",", ".")) if "weight" in fields else None
+    warranty_years = int(fields["warranty"].group("warranty")) if "warranty" in fields else None
 
     # Категория
-    categories = ["промышленный", "уличный", "офисный", "спортивный", "взрывозащищенный", "прожектор"]
     category = None
-    for cat in categories:
-        if cat.lower() in line.lower():
+    for cat in CATEGORIES:
+        if cat in line_lc:
             category = cat
             break
 
     # Модель (ищем ENTECH …)
-    model_match = re.search(r'(ENTECH[^\s,]*)', line, re.IGNORECASE)
+    model_match = _MODEL_RE.search(line)
     model = model_match.group(1) if model_match else None
 
-    # Размеры (например: 600x200x100 мм или 600×200×100 mm)
-    size_match = re.search(r'(\d+)[x×](\d+)[x×](\d+)\s?(мм|mm)', line, re.IGNORECASE)
-    dimensions = {
-        "length_mm": int(size_match.group(1)),
-        "width_mm": int(size_match.group(2)),
-        "height_mm": int(size_match.group(3))
-    } if size_match else None
-
-    # Вес (например: 5кг, 12.5 kg)
-    weight_match = re.search(r'(\d+([.,]\d+)?)\s?(кг|kg)', line, re.IGNORECASE)
-    weight_kg = float(weight_match.group(1).replace(",", ".")) if weight_match else None
-
-    # Гарантия (например: 5 лет, 3 года)
-    warranty_match = re.search(r'(\d+)\s?(лет|года|г.)', line, re.IGNORECASE)
-    warranty_years = int(warranty_match.group(1)) if warranty_match else None
-
-    return {
+    item = {
         "raw": line.strip(),
         "model": model,
         "power_w": power,
@@ -59,25 +82,61 @@ def parse_line(line):
         "weight_kg": weight_kg,
         "warranty_years": warranty_years
     }
+    # обрывки строк (заголовки колонок, единицы измерения в отдельной ячейке) товаром не считаем
+    if all(value is None for key, value in item.items() if key != "raw"):
+        return None
+    return item
+
+def iter_product_lines(text):
+    """
+    Строки текста, в которых есть мощность, люмены или IP: пары (строка, строка в нижнем регистре).
+    Весь текст проверяется одним проходом _PRODUCT_LINE_RE, а не отдельным поиском на каждую строку.
+    """
+    text_lc = text.lower()
+    if len(text_lc) != len(text):
+        # lower() изменил длину (редкие символы) — смещения не совпадут, проверяем построчно
+        for line in text.split("\n"):
+            line_lc = line.lower()
+            if _PRODUCT_LINE_RE.search(line_lc):
+                yield line, line_lc
+        return
+
+    line_end = -1
+    for m in _PRODUCT_LINE_RE.finditer(text_lc):
+        if m.start() < line_end:
+            continue  # эта строка уже отдана
+        line_start = text.rfind("\n", 0, m.start()) + 1
+        line_end = text.find("\n", m.end())
+        if line_end == -1:
+            line_end = len(text)
+        yield text[line_start:line_end], text_lc[line_start:line_end]
 
 def pdf_to_json(pdf_path, json_path):
     catalog = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-
-            lines = text.split("\n")
-            for line in lines:
-                # добавляем только строки с мощностью, люменами или IP
-                if re.search(r'(Вт|W|лм|lm|IP\d{2})', line, re.IGNORECASE):
-                    item = parse_line(line)
-                    catalog.append(item)
-
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(catalog, f, ensure_ascii=False, indent=2)
+    # PDFium (C++) извлекает текст в разы быстрее pdfminer, на котором построен pdfplumber
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        pages = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            # PDFium разделяет строки через \r\n — приводим к \n, как ждёт iter_product_lines
+            pages.append(textpage.get_text_bounded().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+
+    # склеиваем текст всех страниц и ищем строки товаров одним проходом;
+    # строки уже отфильтрованы и приведены к нижнему регистру — повторно это не делаем
+    text = "\n".join(page_text for page_text in pages if page_text)
+    for line, line_lc in iter_product_lines(text):
+        item = _parse_fields(line, line_lc)
+        if item is not None:
+            catalog.append(item)
+
+    with open(json_path, "wb") as f:
+        f.write(orjson.dumps(catalog))
 
     print(f"Сохранено {len(catalog)} товаров в {json_path}")
 
@@ -7,11 +7,12 @@ import helmet from "helmet";
 import rateLimit from "express-rate-limit";
 import NodeCache from "node-cache";
 import winston from "winston";
-import { readFileSync } from "fs";
+import { existsSync, readFileSync, statSync } from "fs";
 import { fileURLToPath } from "url";
 import { dirname } from "path";
 import path from "path";
 import OpenAI from "openai";
+import { decode } from "@msgpack/msgpack";
 
 dotenv.config();
 
@@ -90,8 +91,21 @@ let catalog = [];
 let scenario = {};
 const cache = new NodeCache({ stdTTL: 600 });
 
+// catalog.msgpack (extract_catalog*.py) has raw image bytes; the widget expects a data URL.
+// If both catalog files exist, the one generated last wins.
+function loadCatalog() {
+  const useJson = !existsSync("catalog.msgpack") ||
+    (existsSync("catalog.json") && statSync("catalog.json").mtimeMs >= statSync("catalog.msgpack").mtimeMs);
+  if (useJson) return JSON.parse(readFileSync("catalog.json", "utf8"));
+  return decode(readFileSync("catalog.msgpack")).map(({ image_data, image_type, ...item }) =>
+    image_data
+      ? { ...item, image_base64: `data:${image_type};base64,${Buffer.from(image_data).toString("base64")}` }
+      : item
+  );
+}
+
 try {
-  catalog = JSON.parse(readFileSync("catalog.json", "utf8"));
+  catalog = loadCatalog();
   scenario = JSON.parse(readFileSync("scenario.json", "utf8"));
   logger.info(`Loaded: ${catalog.length} items, scenario OK`);
 } catch (err) {
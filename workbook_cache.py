@@ -0,0 +1,68 @@
+import os
+import pickle
+import sys
+import zipfile
+from python_calamine import CalamineWorkbook
+from xlsx_images import active_sheet_index
+
+# Общая загрузка прайса для всех скриптов: calamine (Rust) читает XLSX в разы быстрее openpyxl,
+# а с use_cache=True разобранные строки сохраняются в pickle рядом с xlsx и при повторных
+# запусках читаются за миллисекунды. Кэш сбрасывается при изменении файла (mtime, size).
+
+CACHE_VERSION = 1
+
+
+def _cell(value):
+    # calamine отдаёт пустые ячейки как '', а целые числа как float — приводим к виду openpyxl
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _read_workbook(path):
+    wb = CalamineWorkbook.from_path(path)
+    sheets = {}
+    for name in wb.sheet_names:
+        # skip_empty_area=False — чтобы строки шли с A1 и номера строк совпадали с Excel
+        rows = wb.get_sheet_by_name(name).to_python(skip_empty_area=False)
+        sheets[name] = [tuple(_cell(v) for v in row) for row in rows]
+    wb.close()
+
+    with zipfile.ZipFile(path) as zf:
+        active = list(sheets)[active_sheet_index(zf)]
+    return sheets, active
+
+
+def use_cache_from_argv(argv=None):
+    """Флаг --cache в аргументах скрипта: брать разобранные строки из pickle-кэша рядом с xlsx."""
+    return "--cache" in (sys.argv[1:] if argv is None else argv)
+
+
+def load_workbook(path, use_cache=False):
+    """
+    Строки всех листов книги: ({имя листа: [кортеж значений строки, ...]}, имя активного листа).
+    Первая строка списка — строка 1 в Excel.
+    """
+    if not use_cache:
+        return _read_workbook(path)
+
+    stat = os.stat(path)
+    key = (CACHE_VERSION, os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    cache_path = f"{path}.cache.pickle"
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, sheets, active = pickle.load(f)
+        if cached_key == key:
+            return sheets, active
+    except Exception:
+        pass  # битый, чужой или устаревший по формату кэш — просто пересобираем
+
+    sheets, active = _read_workbook(path)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump((key, sheets, active), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+    return sheets, active
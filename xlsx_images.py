@@ -0,0 +1,97 @@
+import posixpath
+import xml.etree.ElementTree as ET
+
+# XLSX — это zip-архив; картинки листа лежат в xl/media/*, а привязка к ячейкам
+# описана в xl/drawings/drawingN.xml. Читаем это напрямую, минуя openpyxl и PIL.
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+NS_XDR = "{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}"
+NS_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+REL_DRAWING = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/drawing"
+REL_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+ANCHORS = (NS_XDR + "twoCellAnchor", NS_XDR + "oneCellAnchor", NS_XDR + "absoluteAnchor")
+
+
+def read_rels(zf, part, rel_type=None):
+    """
+    Связи части архива: {rId: путь к целевой части внутри архива}.
+    Например, для 'xl/worksheets/sheet1.xml' читается 'xl/worksheets/_rels/sheet1.xml.rels'.
+    """
+    folder, name = posixpath.split(part)
+    try:
+        root = ET.fromstring(zf.read(posixpath.join(folder, "_rels", name + ".rels")))
+    except KeyError:
+        return {}
+
+    rels = {}
+    for rel in root.iter(NS_PKG_REL + "Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        if rel_type and rel.get("Type") != rel_type:
+            continue
+        target = rel.get("Target")
+        if target.startswith("/"):
+            target = target.lstrip("/")
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = target
+    return rels
+
+
+def active_sheet_index(zf):
+    """Номер активного листа в порядке листов книги (тот же лист, что openpyxl отдаёт как wb.active)."""
+    root = ET.fromstring(zf.read("xl/workbook.xml"))
+    view = root.find(f"{NS_MAIN}bookViews/{NS_MAIN}workbookView")
+    return int(view.get("activeTab", 0)) if view is not None else 0
+
+
+def active_sheet_part(zf):
+    """Путь к XML активного листа."""
+    root = ET.fromstring(zf.read("xl/workbook.xml"))
+    sheets = root.findall(f"{NS_MAIN}sheets/{NS_MAIN}sheet")
+    return read_rels(zf, "xl/workbook.xml")[sheets[active_sheet_index(zf)].get(NS_REL + "id")]
+
+
+def sniff_image_type(data):
+    """MIME-тип по первым байтам для форматов, которые браузер покажет как есть; иначе None."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def sheet_images(zf, sheet_part=None):
+    """
+    Картинки листа в порядке drawing XML: список (row, col, путь к картинке в архиве).
+    row/col — левый верхний угол якоря, начиная с 0 (как img.anchor._from в openpyxl).
+    По умолчанию берётся активный лист.
+    """
+    sheet_part = sheet_part or active_sheet_part(zf)
+    images = []
+
+    for drawing_part in read_rels(zf, sheet_part, REL_DRAWING).values():
+        embeds = read_rels(zf, drawing_part, REL_IMAGE)
+        row = col = r_id = None
+        with zf.open(drawing_part) as f:
+            for _, el in ET.iterparse(f):
+                if el.tag == NS_XDR + "from":
+                    row = int(el.findtext(NS_XDR + "row"))
+                    col = int(el.findtext(NS_XDR + "col"))
+                elif el.tag == NS_A + "blip" and r_id is None:
+                    r_id = el.get(NS_REL + "embed")
+                elif el.tag in ANCHORS:
+                    if row is not None and r_id in embeds:
+                        images.append((row, col, embeds[r_id]))
+                    row = col = r_id = None
+                    el.clear()
+
+    return images